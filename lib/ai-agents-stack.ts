@@ -8,6 +8,8 @@ import * as kms from "aws-cdk-lib/aws-kms";
 import * as lambda from "aws-cdk-lib/aws-lambda";
 import { SqsEventSource } from "aws-cdk-lib/aws-lambda-event-sources";
 import * as secretsmanager from "aws-cdk-lib/aws-secretsmanager";
+import * as sns from "aws-cdk-lib/aws-sns";
+import * as snsSubscriptions from "aws-cdk-lib/aws-sns-subscriptions";
 import * as sqs from "aws-cdk-lib/aws-sqs";
 
 import * as path from "path";
@@ -153,6 +155,19 @@ export class AiAgentsStack extends cdk.Stack {
       },
     });
 
+    // Agent replies fan out to both deliver + persist queues from a single publish
+    const agentReplyTopic = new sns.Topic(this, "AgentReplyTopic");
+    agentReplyTopic.addSubscription(
+      new snsSubscriptions.SqsSubscription(deliverMessagesQueue, {
+        rawMessageDelivery: true,
+      })
+    );
+    agentReplyTopic.addSubscription(
+      new snsSubscriptions.SqsSubscription(persisMessagesQueue, {
+        rawMessageDelivery: true,
+      })
+    );
+
     // =========================================================================
     // Lambdas
     // =========================================================================
@@ -196,6 +211,10 @@ export class AiAgentsStack extends cdk.Stack {
         CHAT_PERSIS_MESSAGE_QUEUE: persisMessagesQueue.queueUrl,
         CHAT_DELIVER_MESSAGE_QUEUE: deliverMessagesQueue.queueUrl,
         CHAT_SESSIONS_TABLE_NAME: chatTable.tableName,
+        AGENT_REPLY_TOPIC_ARN: agentReplyTopic.topicArn,
+        AGENT_REPLY_FANOUT_ENABLED: "false",
+        POWERTOOLS_SERVICE_NAME: "chat-service-lambda",
+        POWERTOOLS_LOG_LEVEL: "INFO",
       },
       layers: [depsLayer],
     });
@@ -279,6 +298,7 @@ export class AiAgentsStack extends cdk.Stack {
     chatServiceLambda.addEventSource(
       new SqsEventSource(chatIngressQueue, {
         batchSize: 1,
+        reportBatchItemFailures: true,
       })
     );
 
@@ -298,6 +318,7 @@ export class AiAgentsStack extends cdk.Stack {
     openAiSecret.grantRead(chatServiceLambda);
     persisMessagesQueue.grantSendMessages(chatServiceLambda);
     deliverMessagesQueue.grantSendMessages(chatServiceLambda);
+    agentReplyTopic.grantPublish(chatServiceLambda);
     // persist message lambda grants
     dataKey.grantEncrypt(persistMessagesLambda);
     chatTable.grantWriteData(persistMessagesLambda);
@@ -1,6 +1,6 @@
 from langchain.tools import tool
 from langchain.agents import create_agent
-from agentLambda.foundational_llm.llms import llm
+from agentLambda.foundational_llm.llms import get_llm
 from agentLambda.middlewares.dynamic_prompts_middleware import calendar_dynamic_prompt
 
 @tool(description="Use this tool when you need to schedule an appointment in the clinic")
@@ -1,9 +1,7 @@
-from typing import Any, Sequence, cast
+from functools import lru_cache
 
-from agentLambda.foundational_llm.llms import llm
+from agentLambda.foundational_llm.llms import get_llm
 from langchain.agents import create_agent
-from langchain.agents.middleware import SummarizationMiddleware
-from langchain.agents.middleware import AgentMiddleware
 from agentLambda.tools.tools import (
     schudule_appointments_tool,
     get_clinic_info_tool,
@@ -17,24 +15,7 @@ from agentLambda.checkpoints.dynamo_memory_checkpoints import dynamo_checkpointe
 from agentLambda.utils.types import Context
 
 
-summarization_middleware: Sequence[AgentMiddleware[Any, Context | None]] = cast(
-    Sequence[AgentMiddleware[Any, Context | None]],
-    [
-        SummarizationMiddleware(
-            model="gpt-4o-mini",
-            tools=[],
-            trigger=("tokens", 4000),
-            keep=("messages", 20),
-        )
-    ],
-)
-
-
-master_agent = create_agent(
-    llm,
-    tools=[schudule_appointments_tool, get_clinic_info_tool, get_doctors_info, re_schudule_appointments_tool, delete_appointments_tool, consult_availability_by_user_id_tool, consult_availability_by_doctor_id_tool],
-    #middleware=summarization_middleware,
-        system_prompt=(
+MASTER_AGENT_SYSTEM_PROMPT = (
         """
         You are an agent for a dental clinic.\n
         You help customers by:\n\n
@@ -101,8 +82,16 @@ master_agent = create_agent(
 
         - If a detail is missing from the facts, ask a short clarifying question.\n
         """
-        ),
-    checkpointer = dynamo_checkpointer,
-    context_schema=Context,
-    
 )
+
+
+@lru_cache(maxsize=1)
+def get_master_agent():
+    # Built on first use: get_llm() fetches the OpenAI secret on demand
+    return create_agent(
+        get_llm(),
+        tools=[schudule_appointments_tool, get_clinic_info_tool, get_doctors_info, re_schudule_appointments_tool, delete_appointments_tool, consult_availability_by_user_id_tool, consult_availability_by_doctor_id_tool],
+        system_prompt=MASTER_AGENT_SYSTEM_PROMPT,
+        checkpointer = dynamo_checkpointer,
+        context_schema=Context,
+    )
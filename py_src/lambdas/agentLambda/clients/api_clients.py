@@ -1,15 +1,54 @@
 import json
 import os
 from typing import Any, Dict, Optional
-from urllib.parse import urlencode
 
 import boto3
-import requests
+from aws_lambda_powertools import Logger
+from botocore.config import Config
+
+from agentLambda.utils.serialization import dumps, loads
+
+
+logger = Logger(child=True)
+# The chat-service lambda has a 30s timeout that also has to cover the LLM calls.
+# Standard mode retries throttling and transient Lambda service errors with jittered backoff.
+# Read timeouts are retried too, so a slow POST would be invoked twice and create a
+# duplicate appointment: non-idempotent methods get their own client with no retries.
+# Worst case per call: 2 x (1s + 10s) = 22s for GET/PATCH/DELETE, 11s for POST.
+CLINIC_CONNECT_TIMEOUT = 1
+CLINIC_READ_TIMEOUT = 10
+CLINIC_IDEMPOTENT_METHODS = frozenset(["GET", "PATCH", "DELETE"])
+
+
+def _build_lambda_client(max_attempts: int):
+    return boto3.client(
+        "lambda",
+        config=Config(
+            retries={"total_max_attempts": max_attempts, "mode": "standard"},
+            connect_timeout=CLINIC_CONNECT_TIMEOUT,
+            read_timeout=CLINIC_READ_TIMEOUT,
+        ),
+    )
 
 
-lambda_client = boto3.client("lambda")
+lambda_client = _build_lambda_client(max_attempts=2)
+lambda_client_no_retry = _build_lambda_client(max_attempts=1)
 CLINIC_LAMBDA_NAME = os.environ.get("CLINIC_LAMBDA_NAME")
 
+# Constant part of the API Gateway proxy event; shallow-copied and filled in per invoke.
+# Nested values are shared between copies and must not be mutated.
+_EVENT_TEMPLATE: Dict[str, Any] = {
+    "headers": {
+        "content-type": "application/json",
+        "accept": "application/json",
+    },
+    "multiValueHeaders": None,
+    "multiValueQueryStringParameters": None,
+    "pathParameters": None,
+    "stageVariables": None,
+    "isBase64Encoded": False,
+}
+
 
 def _invoke_clinic_lambda(
     path: str,
@@ -20,26 +59,16 @@ def _invoke_clinic_lambda(
     if not CLINIC_LAMBDA_NAME:
         raise RuntimeError("CLINIC_LAMBDA_NAME env var is not set")
 
-    api_gateway_event = {
-        "resource": path,
-        "path": path,
-        "httpMethod": http_method,
-        "headers": {
-            "content-type": "application/json",
-            "accept": "application/json",
-        },
-        "multiValueHeaders": None,
-        "queryStringParameters": query or {},
-        "multiValueQueryStringParameters": None,
-        "pathParameters": None,
-        "stageVariables": None,
-        "body": json.dumps(body) if body is not None else None,
-        "isBase64Encoded": False,
-    }
+    api_gateway_event = _EVENT_TEMPLATE.copy()
+    api_gateway_event["resource"] = api_gateway_event["path"] = path
+    api_gateway_event["httpMethod"] = http_method
+    api_gateway_event["queryStringParameters"] = query or {}
+    # ts-lambda-api expects the proxy-event body as a JSON string, so it is encoded once here
+    api_gateway_event["body"] = dumps(body).decode("utf-8") if body is not None else None
 
-    print(
-        "[clinic_lambda.invoke.request]",
-        {
+    logger.debug(
+        "clinic_lambda.invoke.request",
+        extra={
             "method": http_method,
             "path": path,
             "query": query,
@@ -47,35 +76,43 @@ def _invoke_clinic_lambda(
         },
     )
 
-    invoke_response = lambda_client.invoke(
+    client = lambda_client if http_method in CLINIC_IDEMPOTENT_METHODS else lambda_client_no_retry
+    invoke_response = client.invoke(
         FunctionName=CLINIC_LAMBDA_NAME,
         InvocationType="RequestResponse",
-        Payload=json.dumps(api_gateway_event).encode("utf-8"),
+        Payload=dumps(api_gateway_event),
     )
 
     payload_stream = invoke_response["Payload"]
     raw_payload = payload_stream.read()
-    print(
-        "[clinic_lambda.invoke.response]",
-        {
+    logger.debug(
+        "clinic_lambda.invoke.response",
+        extra={
             "statusCode": invoke_response.get("StatusCode"),
             "payloadBytes": len(raw_payload),
         },
     )
 
-    lambda_result = json.loads(raw_payload or b"{}")
+    # orjson parses the bytes as read, with no intermediate str decode; drop the
+    # buffer right away so it isn't held alongside the parsed result
+    lambda_result = loads(raw_payload) if raw_payload else {}
+    del raw_payload
     status_code = lambda_result.get("statusCode", 500)
-    response_body = lambda_result.get("body")
+    response_body = lambda_result.pop("body", None)
+    del lambda_result
 
-    if isinstance(response_body, str):
+    # Only string bodies need a second parse; already-decoded bodies pass through untouched
+    if isinstance(response_body, dict):
+        parsed_body: Any = response_body
+    elif response_body is None:
+        parsed_body = {}
+    elif isinstance(response_body, str):
         try:
-            parsed_body: Any = json.loads(response_body)
+            parsed_body = loads(response_body)
         except json.JSONDecodeError as exc:
             raise RuntimeError(
                 f"Clinic lambda returned non-JSON string body: {response_body}"
             ) from exc
-    elif response_body is None:
-        parsed_body = {}
     else:
         parsed_body = response_body
 
@@ -98,10 +135,8 @@ def fetch_clinic_context(phone_number_id: str):
 
 
 def fetch_doctors_info():
-    res = requests.get(
-        "https://ts0g4u3nu2.execute-api.us-east-1.amazonaws.com/prod/clinic/doctors?tenantId=opal-clinic"
-    ).json()
-    print(res)
+    params = {"tenantId": "opal-clinic"}
+    res = _invoke_clinic_lambda("/clinic/doctors", "GET", query=params)
     return res["body"]
 
 
@@ -127,27 +162,25 @@ def fetch_post_appointments_api(
 def fetch_get_appointments_by_doctor_id_api(
     tenant_id: str, doctor_id: str, from_iso: str, to_iso: str
 ):
-    res = requests.get(
-        f"https://ts0g4u3nu2.execute-api.us-east-1.amazonaws.com/prod/appointments/availability?tenantId={tenant_id}&doctorId={doctor_id}&from={from_iso}&to={to_iso}"
-    ).json()
-    print(res)
-    return res
+    params = {
+        "tenantId": tenant_id,
+        "doctorId": doctor_id,
+        "from": from_iso,
+        "to": to_iso,
+    }
+    return _invoke_clinic_lambda("/appointments/availability", "GET", query=params)
 
 
 def fetch_get_appointments_by_user_id_api(
     tenant_id: str, user_id: str, from_iso: str, to_iso: str
 ):
-    base = "https://ts0g4u3nu2.execute-api.us-east-1.amazonaws.com/prod/appointments/availability"
     params = {
         "tenantId": tenant_id,
         "userId": user_id,
         "from": from_iso,
         "to": to_iso,
     }
-    url = f"{base}?{urlencode(params)}"
-    res = requests.get(url).json()
-    print(res)
-    return res
+    return _invoke_clinic_lambda("/appointments/availability", "GET", query=params)
 
 
 def fetch_patch_appointments_by_appointment_id(
@@ -158,12 +191,9 @@ def fetch_patch_appointments_by_appointment_id(
         "newStartIso": new_start_date,
         "newEndIso": new_end_date,
     }
-    print(payload)
-    res = requests.patch(
-        f"https://ts0g4u3nu2.execute-api.us-east-1.amazonaws.com/prod/appointments/{appointment_id}",
-        data=payload,
-    ).json()
-    print(res)
+    res = _invoke_clinic_lambda(
+        f"/appointments/{appointment_id}", "PATCH", body=payload
+    )
     return res["body"]
 
 
@@ -171,13 +201,9 @@ def fetch_delete_appointments_api(tenant_id: str, appointment_id: str):
     payload = {
         "tenantId": tenant_id,
     }
-    print(payload)
-    res = requests.delete(
-        f"https://ts0g4u3nu2.execute-api.us-east-1.amazonaws.com/prod/appointments/{appointment_id}",
-        data=payload,
-    ).json()
-    print(res)
-    return res
+    return _invoke_clinic_lambda(
+        f"/appointments/{appointment_id}", "DELETE", body=payload
+    )
 
 
 # `tenantId`, `userId`, `doctorId`, `startIso` + `endIso | durationMinutes`
@@ -1,9 +1,22 @@
 import os
-import json
-import requests
+from functools import lru_cache
 from typing import Any, Dict, Optional
 from agentLambda.clients.secret_manager_client import get_secret_json
 
+ERROR_BODY_MAX_BYTES = 2000
+
+
+@lru_cache(maxsize=1)
+def _get_session():
+    # requests is only imported once a message is actually sent.
+    # The session is shared so repeated sends reuse the TLS connection to graph.facebook.com
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20))
+    return session
+
 class WhatsAppSendError(Exception):
     pass
 
@@ -60,20 +73,22 @@ def send_whatsapp_message(
         "Content-Type": "application/json",
     }
 
+    import requests
+
     try:
-        resp = requests.post(url, headers=headers, json=payload, timeout=timeout_seconds)
+        resp = _get_session().post(url, headers=headers, json=payload, timeout=timeout_seconds)
     except requests.RequestException as e:
         raise WhatsAppSendError(f"HTTP request failed: {e}") from e
 
     # WhatsApp errors come back as JSON with "error"
     if not resp.ok:
-        try:
-            err_json = resp.json()
-        except Exception:
-            err_json = {"raw": resp.text}
+        # The error body is already JSON (or raw text): slice the bytes instead of
+        # parsing and re-serializing the whole thing just to truncate it
+        err_body = resp.content[:ERROR_BODY_MAX_BYTES].decode("utf-8", "replace")
 
         raise WhatsAppSendError(
-            f"WhatsApp API error {resp.status_code}: {json.dumps(err_json)[:2000]}"
+            f"WhatsApp API error {resp.status_code}: {err_body}"
         )
 
     return resp.json()
+
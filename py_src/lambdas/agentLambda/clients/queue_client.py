@@ -1,14 +1,19 @@
-import json
 import os
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
 import boto3
 
+from agentLambda.utils.serialization import dumps
+
 
 class QueueDispatchError(Exception):
     pass
 
 
+# SQS/SNS hard limit for entries per SendMessageBatch/PublishBatch call
+SQS_MAX_BATCH_ENTRIES = 10
+
+
 class QueueDispatcher:
     def __init__(self) -> None:
         self._sqs = boto3.client("sqs")
@@ -22,14 +27,27 @@ class QueueDispatcher:
                 "CHAT_DELIVER_MESSAGE_QUEUE env var is required"
             )
 
-    def send_persist_message(
+        # Feature flag: one SNS publish fanning out to both queues instead of two SQS sends
+        self.fanout_enabled = (
+            os.environ.get("AGENT_REPLY_FANOUT_ENABLED", "false").lower() == "true"
+        )
+        self._reply_topic_arn = os.environ.get("AGENT_REPLY_TOPIC_ARN")
+        self._sns = None
+        if self.fanout_enabled:
+            if not self._reply_topic_arn:
+                raise QueueDispatchError(
+                    "AGENT_REPLY_TOPIC_ARN env var is required when fanout is enabled"
+                )
+            self._sns = boto3.client("sns")
+
+    def build_persist_payload(
         self,
         *,
         tenant_id: str,
         user_id: str,
         message_body: str,
         message_id: Optional[str],
-    ) -> None:
+    ) -> Dict[str, Any]:
         payload: Dict[str, Any] = {
             "tenantId": tenant_id,
             "userId": user_id,
@@ -39,10 +57,9 @@ class QueueDispatcher:
         }
         if message_id:
             payload["messageId"] = message_id
+        return payload
 
-        self._send(self._persist_queue_url, payload)
-
-    def send_delivery_message(
+    def build_delivery_payload(
         self,
         *,
         tenant_id: str,
@@ -50,7 +67,7 @@ class QueueDispatcher:
         phone_number_id: str,
         message_body: str,
         message_id: Optional[str],
-    ) -> None:
+    ) -> Dict[str, Any]:
         payload: Dict[str, Any] = {
             "tenantId": tenant_id,
             "userId": user_id,
@@ -61,13 +78,117 @@ class QueueDispatcher:
         }
         if message_id:
             payload["messageId"] = message_id
+        return payload
+
+    def send_persist_message(
+        self,
+        *,
+        tenant_id: str,
+        user_id: str,
+        message_body: str,
+        message_id: Optional[str],
+    ) -> None:
+        payload = self.build_persist_payload(
+            tenant_id=tenant_id,
+            user_id=user_id,
+            message_body=message_body,
+            message_id=message_id,
+        )
+        self._send(self._persist_queue_url, payload)
 
+    def send_delivery_message(
+        self,
+        *,
+        tenant_id: str,
+        user_id: str,
+        phone_number_id: str,
+        message_body: str,
+        message_id: Optional[str],
+    ) -> None:
+        payload = self.build_delivery_payload(
+            tenant_id=tenant_id,
+            user_id=user_id,
+            phone_number_id=phone_number_id,
+            message_body=message_body,
+            message_id=message_id,
+        )
         self._send(self._deliver_queue_url, payload)
 
+    def build_fanout_payload(
+        self,
+        delivery_payload: Dict[str, Any],
+        persist_payload: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        # deliverMessages and persistMessages each read only their own fields and ignore
+        # the rest, so one merged body serves both queues without a discriminator
+        return {**delivery_payload, **persist_payload}
+
+    def publish_fanout_batch(self, payloads: Sequence[Dict[str, Any]]) -> None:
+        self._publish_in_batches(
+            self._reply_topic_arn,
+            payloads,
+            body_key="Message",
+            send=lambda entries: self._sns.publish_batch(
+                TopicArn=self._reply_topic_arn, PublishBatchRequestEntries=entries
+            ),
+        )
+
+    def send_persist_batch(self, entries: Sequence[Dict[str, Any]]) -> None:
+        self._send_batch(self._persist_queue_url, entries)
+
+    def send_delivery_batch(self, entries: Sequence[Dict[str, Any]]) -> None:
+        self._send_batch(self._deliver_queue_url, entries)
+
     def _send(self, queue_url: str, payload: Dict[str, Any]) -> None:
         try:
-            self._sqs.send_message(QueueUrl=queue_url, MessageBody=json.dumps(payload))
+            self._sqs.send_message(QueueUrl=queue_url, MessageBody=dumps(payload).decode("utf-8"))
         except Exception as err:  # pragma: no cover - bubble up for Lambda retry
             raise QueueDispatchError(
                 f"Failed to publish message to {queue_url}: {err}"
             ) from err
+
+    def _send_batch(self, queue_url: str, payloads: Sequence[Dict[str, Any]]) -> None:
+        self._publish_in_batches(
+            queue_url,
+            payloads,
+            body_key="MessageBody",
+            send=lambda entries: self._sqs.send_message_batch(
+                QueueUrl=queue_url, Entries=entries
+            ),
+        )
+
+    def _publish_in_batches(
+        self,
+        destination: str,
+        payloads: Sequence[Dict[str, Any]],
+        *,
+        body_key: str,
+        send: Callable[[List[Dict[str, str]]], Dict[str, Any]],
+    ) -> None:
+        """Send payloads in chunks of 10 via `send` (SQS SendMessageBatch or SNS PublishBatch).
+
+        `body_key` is the entry field holding the serialized payload. Raises
+        QueueDispatchError if a call fails or any entry is reported in `Failed`.
+        """
+        failed: List[str] = []
+        for start in range(0, len(payloads), SQS_MAX_BATCH_ENTRIES):
+            chunk = payloads[start : start + SQS_MAX_BATCH_ENTRIES]
+            entries = [
+                {"Id": str(start + i), body_key: dumps(p).decode("utf-8")}
+                for i, p in enumerate(chunk)
+            ]
+            try:
+                resp = send(entries)
+            except Exception as err:  # pragma: no cover - bubble up for Lambda retry
+                raise QueueDispatchError(
+                    f"Failed to publish batch to {destination}: {err}"
+                ) from err
+            failed.extend(
+                f"{f.get('Id')}: {f.get('Code')} {f.get('Message', '')}".strip()
+                for f in resp.get("Failed", [])
+            )
+
+        if failed:
+            raise QueueDispatchError(
+                f"Failed to publish {len(failed)} message(s) to {destination}: {failed}"
+            )
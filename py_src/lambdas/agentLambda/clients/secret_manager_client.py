@@ -1,7 +1,32 @@
-import json
+import threading
+import time
+
 import boto3
 
+from agentLambda.utils.serialization import loads
+
+_sm = boto3.client("secretsmanager")
+
+# Secrets are stable per tenant; cache them for a while but expire so rotations are picked up
+SECRET_CACHE_TTL_SECONDS = 600
+SECRET_CACHE_MAX_ENTRIES = 32
+
+_cache: dict[str, tuple[float, dict]] = {}
+_cache_lock = threading.Lock()
+
 def get_secret_json(secret_name: str) -> dict:
-    sm = boto3.client("secretsmanager")
-    resp = sm.get_secret_value(SecretId=secret_name)
-    return json.loads(resp["SecretString"])
+    now = time.monotonic()
+    with _cache_lock:
+        cached = _cache.get(secret_name)
+        if cached and cached[0] > now:
+            return cached[1]
+
+    resp = _sm.get_secret_value(SecretId=secret_name)
+    secret = loads(resp["SecretString"])
+
+    with _cache_lock:
+        if secret_name not in _cache and len(_cache) >= SECRET_CACHE_MAX_ENTRIES:
+            # Evict the entry closest to expiry
+            del _cache[min(_cache, key=lambda k: _cache[k][0])]
+        _cache[secret_name] = (now + SECRET_CACHE_TTL_SECONDS, secret)
+    return secret
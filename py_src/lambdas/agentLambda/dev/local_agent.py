@@ -1,18 +1,20 @@
-from agentLambda.agents.master_agent import master_agent
+from agentLambda.agents.master_agent import get_master_agent
 from agentLambda.utils.types import Context
 
 
-ended = True
+CONTEXT = Context(tenant_id='opal-clinic', user_id='22484592', phone_number_id='121212121212')
+CONFIG = {"configurable": {"thread_id": '22484538'}}
 
-while ended:
+master_agent = get_master_agent()
+
+while True:
     user_message= input('> (q for exit): ')
     if user_message =='q':
         break
-    context = Context(tenant_id='opal-clinic', user_id='22484592', phone_number_id='121212121212')
     response = master_agent.invoke(
         {"messages": [{"role": "user", "content": user_message}]},
-        context=context,
-        config={"configurable": {"thread_id": '22484538'}},
+        context=CONTEXT,
+        config=CONFIG,
     )
     assitant_message = response["messages"][-1].content
-    print(f'>Assitant: {assitant_message}')
\ No newline at end of file
+    print(f'>Assitant: {assitant_message}')
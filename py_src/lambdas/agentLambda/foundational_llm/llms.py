@@ -1,10 +1,15 @@
 import json
 import os
+from functools import lru_cache
+
 import boto3
 from langchain.chat_models import init_chat_model
 
+from agentLambda.utils.serialization import loads
+
 SECRET_ID = os.environ["OPENAI_SECRET_ID"]  
 REGION = os.environ.get("AWS_REGION", "us-east-1")
+OPENAI_PREWARM_URL = "https://api.openai.com/v1/"
 
 _sm = boto3.client("secretsmanager", region_name=REGION)
 _cached_key: str | None = None
@@ -19,7 +24,7 @@ def get_openai_api_key() -> str:
 
     # If your secret is JSON like {"OPENAI_API_KEY":"sk-..."}
     try:
-        data = json.loads(secret_str)
+        data = loads(secret_str)
         key = data.get("OPENAI_API_KEY") or data.get("api_key")
         if not key:
             raise ValueError("Secret JSON didn't include OPENAI_API_KEY/api_key")
@@ -29,7 +34,36 @@ def get_openai_api_key() -> str:
     _cached_key = key
     return key
 
-os.environ["OPENAI_API_KEY"] = get_openai_api_key()
+@lru_cache(maxsize=1)
+def _get_http_client():
+    import httpx
+
+    # One keep-alive pool per container so warm invocations reuse the connection to api.openai.com.
+    # Idle connections are kept for a minute so one opened during init survives until the first request
+    return httpx.Client(
+        timeout=httpx.Timeout(60.0, connect=5.0),
+        limits=httpx.Limits(
+            max_connections=20, max_keepalive_connections=10, keepalive_expiry=60.0
+        ),
+    )
+
+
+@lru_cache(maxsize=1)
+def get_llm():
+    # Built on first use rather than at import so the secret fetch happens on demand;
+    # a failed attempt is not cached and is retried on the next call
+    os.environ["OPENAI_API_KEY"] = get_openai_api_key()
+    return init_chat_model("gpt-4.1", http_client=_get_http_client())
+
+
+def prewarm_connection() -> None:
+    """Open the pooled TLS connection to api.openai.com ahead of the first request."""
+    try:
+        _get_http_client().head(OPENAI_PREWARM_URL, timeout=2.0)
+    except Exception:
+        pass
 
-llm = init_chat_model("gpt-4.1")
 
+# Only inside Lambda: moves the handshake into init instead of the first user request
+if os.environ.get("AWS_EXECUTION_ENV"):
+    prewarm_connection()
@@ -1,42 +1,108 @@
-from agentLambda.agents.master_agent import master_agent
+from agentLambda.agents.master_agent import get_master_agent
+from aws_lambda_powertools import Logger
 from aws_lambda_powertools.utilities.data_classes import (
     SQSEvent,
     SQSRecord,
     event_source,
 )
 from agentLambda.utils.types import Context
-import json
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from agentLambda.utils.serialization import loads
 from agentLambda.clients.queue_client import QueueDispatcher
 
-# os.environ["OPENAI_API_KEY"]
-# os.environ["AWS_REGION"]
-# os.environ["AWS_ACCESS_KEY_ID"]
-# os.environ["AWS_SECRET_ACCESS_KEY"]
-# os.environ["AWS_SESSION_TOKEN"]
-# os.environ["AWS_DEFAULT_REGION"]
-
+logger = Logger()
 dispatcher = QueueDispatcher()
 
 
 @event_source(data_class=SQSEvent)
 def handler(event: SQSEvent, context):
-    print(f"SQSevent: {event}")
+    logger.debug("sqs.event", extra={"records": len(list(event.records))})
+    # Records sharing a FIFO message group (same user thread) keep their order,
+    # independent groups are processed concurrently
+    groups: dict[str, list[SQSRecord]] = {}
     for record in event.records:
-        message, sqs_message_id = process_record(record)
-        print(f"Received message ID: {sqs_message_id}")
-        print(f"Received message message: ")
-        sqs_message= json.loads(message)
+        group_id = record.attributes.message_group_id or record.message_id
+        groups.setdefault(group_id, []).append(record)
+
+    delivery_batch = []
+    persist_batch = []
+    failed_message_ids: list[str] = []
+    if not groups:
+        return {"batchItemFailures": []}
+
+    # Build the agent once here so worker threads don't race its lazy init
+    get_master_agent()
+    # One pool per invocation for both record processing and the two queue flushes
+    with ThreadPoolExecutor(max_workers=min(10, max(2, len(groups)))) as pool:
+        futures = [pool.submit(process_group, group) for group in groups.values()]
+        for future in as_completed(futures):
+            payloads, failed = future.result()
+            for delivery_payload, persist_payload in payloads:
+                delivery_batch.append(delivery_payload)
+                persist_batch.append(persist_payload)
+            failed_message_ids.extend(failed)
+
+        if dispatcher.fanout_enabled:
+            # Single SNS publish per reply; the topic fans out to both queues server-side
+            if delivery_batch:
+                dispatcher.publish_fanout_batch(
+                    [
+                        dispatcher.build_fanout_payload(delivery_payload, persist_payload)
+                        for delivery_payload, persist_payload in zip(delivery_batch, persist_batch)
+                    ]
+                )
+        else:
+            # One SendMessageBatch per queue (per 10 records) instead of two sends per record;
+            # the queues are independent so both publishes run concurrently
+            futures = []
+            if delivery_batch:
+                futures.append(pool.submit(dispatcher.send_delivery_batch, delivery_batch))
+            if persist_batch:
+                futures.append(pool.submit(dispatcher.send_persist_batch, persist_batch))
+            wait(futures)
+            for future in futures:
+                future.result()
+
+    # Partial batch response: only the failed records go back to the queue
+    return {
+        "batchItemFailures": [
+            {"itemIdentifier": message_id} for message_id in failed_message_ids
+        ]
+    }
+
 
-        tenant_id= sqs_message['tenantId']
-        user_id= sqs_message['userId']
-        user_message= sqs_message['combinedText']                                          #############################
-        phone_number_id =sqs_message["whatsappMeta"]["phoneNumberId"]                      # Tech debth fix this parse #
-        original_message_id = sqs_message.get("messageId")
-        print(tenant_id, user_id, user_message, phone_number_id, phone_number_id)          #############################
-        invoke_handler(tenant_id, user_message, user_id, phone_number_id, original_message_id)
+def process_group(records: list[SQSRecord]) -> tuple[list[tuple[dict, dict]], list[str]]:
+    payloads = []
+    for index, record in enumerate(records):
+        try:
+            payloads.append(process_one(record))
+        except Exception:
+            logger.exception("sqs.record.failed", extra={"message_id": record.message_id})
+            # FIFO: the rest of the group must be retried after the failed record
+            return payloads, [r.message_id for r in records[index:]]
+    return payloads, []
 
 
-    return {"statusCode": 200, "body": "Messages processed with Powertools"}
+def process_one(record: SQSRecord) -> tuple[dict, dict]:
+    message, sqs_message_id = process_record(record)
+    logger.info("sqs.record.received", extra={"message_id": sqs_message_id})
+    sqs_message= loads(message)
+
+    tenant_id= sqs_message['tenantId']
+    user_id= sqs_message['userId']
+    user_message= sqs_message['combinedText']                                          #############################
+    phone_number_id =sqs_message["whatsappMeta"]["phoneNumberId"]                      # Tech debth fix this parse #
+    original_message_id = sqs_message.get("messageId")                                 #############################
+    logger.debug(
+        "sqs.record.payload",
+        extra={
+            "tenant_id": tenant_id,
+            "user_id": user_id,
+            "user_message": user_message,
+            "phone_number_id": phone_number_id,
+        },
+    )
+    return invoke_handler(tenant_id, user_message, user_id, phone_number_id, original_message_id)
 
 
 def process_record(record: SQSRecord) -> tuple[str, str]:
@@ -45,26 +111,35 @@ def process_record(record: SQSRecord) -> tuple[str, str]:
     return message, message_id
 
 
+def _build_input(user_message: str) -> dict:
+    return {"messages": [{"role": "user", "content": user_message}]}
+
+
+def _build_config(user_id: str) -> dict:
+    # Fresh dict per call: the agent run may attach state to its config
+    return {"configurable": {"thread_id": user_id}}
+
+
 def invoke_handler(tenant_id, user_message, user_id, phone_numberId, original_message_id):
     context = Context(tenant_id=tenant_id, user_id=user_id, phone_number_id=phone_numberId)
-    response = master_agent.invoke(
-        {"messages": [{"role": "user", "content": user_message}]},
+    response = get_master_agent().invoke(
+        _build_input(user_message),
         context=context,
-        config={"configurable": {"thread_id": user_id}},
+        config=_build_config(user_id),
     )
     assitant_message = response["messages"][-1].content
-    print(f'>Assitant: {assitant_message}')
-    dispatcher.send_delivery_message(
+    logger.debug("agent.response", extra={"assistant_message": assitant_message})
+    delivery_payload = dispatcher.build_delivery_payload(
         tenant_id=tenant_id,
         user_id=user_id,
         phone_number_id=phone_numberId,
         message_body=assitant_message,
         message_id=original_message_id,
     )
-    dispatcher.send_persist_message(
+    persist_payload = dispatcher.build_persist_payload(
         tenant_id=tenant_id,
         user_id=user_id,
         message_body=assitant_message,
         message_id=original_message_id,
     )
-    print('>All good')
+    return delivery_payload, persist_payload
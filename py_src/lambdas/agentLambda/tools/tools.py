@@ -1,3 +1,4 @@
+from aws_lambda_powertools import Logger
 from langchain.tools import tool, ToolRuntime
 from pydantic import BaseModel, Field
 from agentLambda.clients.api_clients import (
@@ -11,6 +12,8 @@ from agentLambda.clients.api_clients import (
 )
 from agentLambda.utils.types import Context
 
+logger = Logger(child=True)
+
 #############################################
 
 
@@ -46,8 +49,9 @@ def schudule_appointments_tool(
     res = fetch_post_appointments_api(
         tenant_id, user_id, doctor_id, apointment_date, duration_minutes, patient_name
     )
-    print(
-        f"This will schedule a metting with -> {user_id} and {tenant_id} pass it though the context it will last {duration_minutes}"
+    logger.info(
+        "tool.schedule_appointment",
+        extra={"user_id": user_id, "tenant_id": tenant_id, "duration_minutes": duration_minutes},
     )
     # Returns the appointment payload coming from the scheduling API request.
     return res
@@ -84,7 +88,7 @@ def re_schudule_appointments_tool(
     Use this tool when you need to re schedule an event
     """
     tenant_id = runtime.context.tenant_id
-    print(f"re_schedule appointment tool ")
+    logger.info("tool.re_schedule_appointment", extra={"appointment_id": appointment_id})
 
     res = fetch_patch_appointments_by_appointment_id(
         appointment_id, new_start, new_end, tenant_id
@@ -115,7 +119,7 @@ def delete_appointments_tool(
     tenant_id = runtime.context.tenant_id
 
     res = fetch_delete_appointments_api(tenant_id, appointment_id)
-    print(f"Appointment with {appointment_id} deleted {res}")
+    logger.info("tool.delete_appointment", extra={"appointment_id": appointment_id})
     # Confirms deletion of the provided appointment_id for the tenant.
     return {"sucess": res}
 
@@ -141,14 +145,14 @@ def consult_availability_by_doctor_id_tool(
     """
     Use this tool when you need to consult the availability of a doctor in a specific range of time in the calendar
     """
-    print(
-        f"Cheching Availability for doctor_id {doctor_id} from {from_iso} to {to_iso}\n"
+    logger.info(
+        "tool.consult_availability_by_doctor",
+        extra={"doctor_id": doctor_id, "from_iso": from_iso, "to_iso": to_iso},
     )
     tenant_id = runtime.context.tenant_id
     res = fetch_get_appointments_by_doctor_id_api(
         tenant_id, doctor_id, from_iso, to_iso
     )
-    print(res)
     # Surfaces the doctor's availability within the requested date range.
     return res
 
@@ -176,9 +180,11 @@ def consult_availability_by_user_id_tool(
 
     user_id = runtime.context.user_id
     tenant_id = runtime.context.tenant_id
-    print(f"Cheching Availability for user {user_id} from {from_iso} to {to_iso}\n")
+    logger.info(
+        "tool.consult_availability_by_user",
+        extra={"user_id": user_id, "from_iso": from_iso, "to_iso": to_iso},
+    )
     res = fetch_get_appointments_by_user_id_api(tenant_id, user_id, from_iso, to_iso)
-    print(res)
     # Provides the current user's appointments between the requested timestamps.
     return res
 
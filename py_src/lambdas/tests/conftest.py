@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Tests run from py_src/lambdas; make the agentLambda package importable from here
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
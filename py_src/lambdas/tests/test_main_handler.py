@@ -0,0 +1,126 @@
+import os
+import sys
+import types
+from types import SimpleNamespace
+
+import pytest
+
+# master_agent builds the langchain agent and needs the OpenAI secret; the handler only
+# calls get_master_agent, which each test replaces with a fake agent
+_master_agent_stub = types.ModuleType("agentLambda.agents.master_agent")
+_master_agent_stub.get_master_agent = lambda: None
+sys.modules.setdefault("agentLambda.agents.master_agent", _master_agent_stub)
+
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+os.environ.setdefault("CHAT_PERSIS_MESSAGE_QUEUE", "https://sqs.local/persist")
+os.environ.setdefault("CHAT_DELIVER_MESSAGE_QUEUE", "https://sqs.local/deliver")
+
+from agentLambda import main  # noqa: E402
+from agentLambda.clients.queue_client import QueueDispatchError  # noqa: E402
+from agentLambda.utils.serialization import dumps, loads  # noqa: E402
+
+
+class FakeAgent:
+    def invoke(self, agent_input, context, config):
+        text = agent_input["messages"][0]["content"]
+        if text == "boom":
+            raise RuntimeError("agent failed")
+        return {"messages": [SimpleNamespace(content=f"reply to {text}")]}
+
+
+class FakeSQS:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.batches = []
+
+    def send_message_batch(self, QueueUrl, Entries):
+        self.batches.append((QueueUrl, Entries))
+        if self.fail:
+            return {"Failed": [{"Id": Entries[0]["Id"], "Code": "InternalError"}]}
+        return {"Successful": [{"Id": e["Id"]} for e in Entries]}
+
+
+class FakeSNS:
+    def __init__(self):
+        self.batches = []
+
+    def publish_batch(self, TopicArn, PublishBatchRequestEntries):
+        self.batches.append((TopicArn, PublishBatchRequestEntries))
+        return {"Successful": [{"Id": e["Id"]} for e in PublishBatchRequestEntries]}
+
+
+def _record(message_id, group_id, text):
+    body = {
+        "tenantId": "opal-clinic",
+        "userId": group_id,
+        "combinedText": text,
+        "whatsappMeta": {"phoneNumberId": "121212121212"},
+        "messageId": f"wa-{message_id}",
+    }
+    return {
+        "messageId": message_id,
+        "body": dumps(body).decode("utf-8"),
+        "attributes": {"MessageGroupId": group_id},
+    }
+
+
+@pytest.fixture
+def sqs(monkeypatch):
+    fake = FakeSQS()
+    monkeypatch.setattr(main, "get_master_agent", FakeAgent)
+    monkeypatch.setattr(main.dispatcher, "_sqs", fake)
+    monkeypatch.setattr(main.dispatcher, "fanout_enabled", False)
+    return fake
+
+
+def test_failed_record_fails_rest_of_its_group_and_other_groups_flush(sqs):
+    event = {
+        "Records": [
+            _record("a1", "user-a", "hello"),
+            _record("a2", "user-a", "boom"),
+            _record("a3", "user-a", "after"),
+            _record("b1", "user-b", "hi"),
+        ]
+    }
+
+    result = main.handler(event, None)
+
+    assert sorted(f["itemIdentifier"] for f in result["batchItemFailures"]) == ["a2", "a3"]
+    flushed = {url: [e["MessageBody"] for e in entries] for url, entries in sqs.batches}
+    assert set(flushed) == {"https://sqs.local/deliver", "https://sqs.local/persist"}
+    for bodies in flushed.values():
+        assert len(bodies) == 2
+        assert any("reply to hello" in b for b in bodies)
+        assert any("reply to hi" in b for b in bodies)
+        assert not any("reply to after" in b for b in bodies)
+
+
+def test_batch_send_failure_propagates(sqs):
+    sqs.fail = True
+
+    with pytest.raises(QueueDispatchError):
+        main.handler({"Records": [_record("b1", "user-b", "hi")]}, None)
+
+
+def test_fanout_publishes_one_merged_message_per_reply(sqs, monkeypatch):
+    sns = FakeSNS()
+    monkeypatch.setattr(main.dispatcher, "fanout_enabled", True)
+    monkeypatch.setattr(main.dispatcher, "_sns", sns)
+    monkeypatch.setattr(main.dispatcher, "_reply_topic_arn", "arn:aws:sns:local:reply")
+
+    result = main.handler(
+        {"Records": [_record("a1", "user-a", "hello"), _record("b1", "user-b", "hi")]},
+        None,
+    )
+
+    assert result["batchItemFailures"] == []
+    assert sqs.batches == []
+    assert len(sns.batches) == 1
+    topic_arn, entries = sns.batches[0]
+    assert topic_arn == "arn:aws:sns:local:reply"
+    messages = sorted((loads(e["Message"]) for e in entries), key=lambda m: m["userId"])
+    assert [m["messageBody"] for m in messages] == ["reply to hello", "reply to hi"]
+    for message in messages:
+        # Fields each consumer needs: deliverMessages (phoneNumberId) and persistMessages (role)
+        assert message["phoneNumberId"] == "121212121212"
+        assert message["role"] == "AGENT"